@@ -0,0 +1,186 @@
+import sys
+import uuid
+from datetime import date, time
+
+from fastapi import Response
+from sqlalchemy import event, func, tuple_
+
+from main import (
+    Base, engine, SessionLocal, migrate_slot_load_doctor, migrate_indexes, calendar_source_statements, schedule_statement, SCHEDULE_ORDER,
+    PatientVisit, Message, SlotLoad, SlotLoadStats, SlotOccupancy, OTP, TokenRevocation, EmailOutbox,
+    User, Doctor, UserRole, Principal, SCHEDULE_MAX_PAGE_SIZE, view_schedule, doctor_schedule, my_appointments
+)
+
+def hot_queries(db):
+    # Same filters as the routes; parameter values don't affect the plan
+    d = date.today()
+    t = time(10, 0)
+    _, calendar_weekly, calendar_exceptions = calendar_source_statements(1, dates=[d])
+    return {
+        "reminder engine reload": db.query(PatientVisit.visit_id, PatientVisit.visit_date, PatientVisit.time_slot).filter(
+            PatientVisit.visit_date >= d, PatientVisit.visit_date <= d),
+        "reminder engine new visits": db.query(PatientVisit.visit_id, PatientVisit.visit_date, PatientVisit.time_slot).filter(
+            PatientVisit.visit_id > 1),
+        "/schedule": schedule_statement(PatientVisit.visit_date == d),
+        "/schedule?doctor_id": schedule_statement(PatientVisit.visit_date == d, PatientVisit.doctor_id == 1),
+        "/doctors/{id}/public-slots occupancy": db.query(SlotOccupancy).filter(
+            SlotOccupancy.doctor_id == 1, SlotOccupancy.slot_date == d),
+        "/doctors/{id}/public-slots/range occupancy": db.query(SlotOccupancy).filter(
+            SlotOccupancy.doctor_id == 1, SlotOccupancy.slot_date >= d, SlotOccupancy.slot_date <= d),
+        "/doctors/next-available occupancy": db.query(SlotOccupancy).filter(
+            SlotOccupancy.doctor_id.in_([1, 2]), SlotOccupancy.slot_date >= d, SlotOccupancy.slot_date <= d),
+        "cancel occupancy release": db.query(PatientVisit).filter(
+            PatientVisit.doctor_id == 1, PatientVisit.visit_date == d, PatientVisit.visit_id != 1),
+        "calendar rebuild weekly": calendar_weekly,
+        "calendar rebuild exceptions": calendar_exceptions,
+        "/visits crowd stats": db.query(SlotLoadStats).filter(SlotLoadStats.doctor_id == 1, SlotLoadStats.slot_date == d),
+        "/visits slot lookup": db.query(SlotLoad).filter(
+            SlotLoad.doctor_id == 1, SlotLoad.slot_date == d, SlotLoad.time_slot == t),
+        "/stats/crowd": db.query(SlotLoad.time_slot, func.sum(SlotLoad.current_patients)).filter(
+            SlotLoad.slot_date == d).group_by(SlotLoad.time_slot),
+        "/doctor/me/schedule": schedule_statement(PatientVisit.doctor_id == 1).order_by(*SCHEDULE_ORDER).limit(101),
+        "/doctor/me/schedule?from&to&cursor": schedule_statement(
+            PatientVisit.doctor_id == 1, PatientVisit.visit_date >= d, PatientVisit.visit_date <= d,
+            tuple_(*SCHEDULE_ORDER) > tuple_(d, t, 1)).order_by(*SCHEDULE_ORDER).limit(101),
+        "/my/appointments": schedule_statement(PatientVisit.created_by == 1).order_by(*SCHEDULE_ORDER).limit(101),
+        "/my/appointments?cursor": schedule_statement(
+            PatientVisit.created_by == 1, tuple_(*SCHEDULE_ORDER) > tuple_(d, t, 1)).order_by(*SCHEDULE_ORDER).limit(101),
+        "/messages/unread": db.query(Message).filter(Message.recipient_id == 1, Message.is_read == False),
+        "/messages/history": db.query(Message).filter(
+            ((Message.sender_id == 1) & (Message.recipient_id == 2)) |
+            ((Message.sender_id == 2) & (Message.recipient_id == 1))
+        ),
+        "/messages/conversations": db.query(Message).filter((Message.sender_id == 1) | (Message.recipient_id == 1)),
+        "auth revoked token check": db.query(TokenRevocation.id).filter(TokenRevocation.jti == "0" * 32),
+        "email dispatcher claim": db.query(EmailOutbox.id).filter(
+            EmailOutbox.status.in_(("pending", "sending")), EmailOutbox.next_attempt_at <= d).order_by(EmailOutbox.next_attempt_at),
+        "/auth/otp/verify": db.query(OTP).filter(OTP.email == "x@example.com", OTP.code == "000000"),
+    }
+
+def explain(db, query):
+    statement = getattr(query, "statement", query) # ORM Query or select()
+    compiled = statement.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True}) # Expand IN lists
+    params = tuple([None] * len(compiled.positiontup or []))
+    rows = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params).all()
+    return [row[-1] for row in rows]
+
+def check_query_plans():
+    if engine.dialect.name != "sqlite":
+        print(f"EXPLAIN QUERY PLAN is SQLite only (DATABASE_URL uses {engine.dialect.name}). Use EXPLAIN in psql instead.")
+        return None
+    Base.metadata.create_all(bind=engine)
+    migrate_slot_load_doctor()
+    migrate_indexes()
+
+    db = SessionLocal()
+    failures = 0
+    try:
+        for name, query in hot_queries(db).items():
+            plan = explain(db, query)
+            scans = [step for step in plan if step.startswith("SCAN ")]
+            status = "FULL SCAN" if scans else "ok"
+            if scans:
+                failures += 1
+            print(f"[{status}] {name}")
+            for step in plan:
+                print(f"    {step}")
+    finally:
+        db.close()
+    return failures
+
+QUERY_COUNT_VISITS = 50
+
+def count_queries(fn):
+    executed = []
+    listener = lambda *args: executed.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return len(executed)
+
+def check_query_counts():
+    """Schedule listings must cost the same number of queries for 1 visit and for many.
+    Runs on seed rows inside a transaction that is rolled back, so any DATABASE_URL works."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    failures = 0
+    try:
+        tag = uuid.uuid4().hex[:8]
+        day = date(2099, 1, 1) # Clear of real visits
+
+        def add_doctor(name):
+            user = User(username=f"query-count-{name}-{tag}", password_hash="-", role=UserRole.DOCTOR)
+            db.add(user)
+            db.flush()
+            doctor = Doctor(user_id=user.id, name=name, specialization="-")
+            db.add(doctor)
+            db.flush()
+            return user.id, doctor.doctor_id
+
+        def add_patient(name):
+            user = User(username=f"query-count-{name}-{tag}", password_hash="-", role=UserRole.PATIENT)
+            db.add(user)
+            db.flush()
+            return user.id
+
+        # The checked doctor's visits each have their own patient, and the checked patient's visits
+        # each have their own doctor, so per-visit lookups can't be answered from the session
+        doctor_user_id, doctor_id = add_doctor("doctor")
+        patient_id = add_patient("patient")
+        as_doctor = Principal(doctor_user_id, "doctor", UserRole.DOCTOR, None, True, doctor_id)
+        as_patient = Principal(patient_id, "patient", UserRole.PATIENT, None, True, None)
+        listings = {
+            "/schedule": lambda: view_schedule(date=day.isoformat(), doctor_id=doctor_id, db=db),
+            "/doctor/me/schedule": lambda: doctor_schedule(
+                response=Response(), from_date=day.isoformat(), to=None, cursor=None, limit=SCHEDULE_MAX_PAGE_SIZE,
+                current_user=as_doctor, db=db),
+            "/my/appointments": lambda: my_appointments(
+                response=Response(), from_date=day.isoformat(), to=None, cursor=None, limit=SCHEDULE_MAX_PAGE_SIZE,
+                current_user=as_patient, db=db),
+        }
+
+        def add_visits(n, start):
+            for i in range(start, start + n):
+                slot = time(9 + i // 60, i % 60)
+                other_patient_id = add_patient(f"patient-{i}")
+                _, other_doctor_id = add_doctor(f"doctor-{i}")
+                db.add_all([
+                    PatientVisit(visit_date=day, time_slot=slot, gender="Male", visit_type="Consultation",
+                                 doctor_id=doctor_id, created_by=other_patient_id),
+                    PatientVisit(visit_date=day, time_slot=slot, gender="Male", visit_type="Consultation",
+                                 doctor_id=other_doctor_id, created_by=patient_id),
+                ])
+            db.flush()
+            db.expunge_all() # Start each listing with an empty session, as a request does
+
+        add_visits(1, 0)
+        one = {name: count_queries(fn) for name, fn in listings.items()}
+        add_visits(QUERY_COUNT_VISITS - 1, 1)
+        many = {name: count_queries(fn) for name, fn in listings.items()}
+        for name in listings:
+            status = "ok" if one[name] == many[name] else "N+1"
+            if one[name] != many[name]:
+                failures += 1
+            print(f"[{status}] {name}: {one[name]} queries for 1 visit, {many[name]} for {QUERY_COUNT_VISITS}")
+    finally:
+        db.rollback()
+        db.close()
+    return failures
+
+if __name__ == "__main__":
+    failed = check_query_plans()
+    if failed is None:
+        print(f"Query plan check skipped for {engine.dialect.name}.")
+    elif failed:
+        print(f"{failed} hot queries are not using an index.")
+    else:
+        print("All hot queries use an index.")
+    n_plus_one = check_query_counts()
+    if n_plus_one:
+        print(f"{n_plus_one} schedule listings issue a query per visit.")
+    else:
+        print("Schedule listings use a constant number of queries.")
+    if failed or n_plus_one:
+        sys.exit(1)
@@ -1,10 +1,14 @@
-from main import Base, engine, SessionLocal, User, UserRole, get_password_hash
+import shutil
+
+from main import Base, engine, SessionLocal, User, UserRole, get_password_hash, AVAILABILITY_CACHE_DIR
 
 def reset_database():
     print("Dropping all tables...")
     Base.metadata.drop_all(bind=engine)
     print("Creating all tables...")
     Base.metadata.create_all(bind=engine)
+    # Cached calendars belong to the wiped doctors
+    shutil.rmtree(AVAILABILITY_CACHE_DIR, ignore_errors=True)
     print("Database reset complete.")
     
     # Re-create admin since we wiped it
@@ -603,76 +603,56 @@ async function loadView(viewName) {
     else if (viewName === 'my-schedule') {
         const endpoint = state.role === 'Doctor' ? '/doctor/me/schedule' : '/my/appointments';
 
-        const res = await authFetch(endpoint);
+        // Pages come in date/time order; X-Next-Cursor is set while more remain
+        const fetchPage = (cursor) => authFetch(cursor ? `${endpoint}?cursor=${encodeURIComponent(cursor)}` : endpoint);
+
+        const res = await fetchPage(null);
         if (!res.ok) return content.innerHTML = '<p>Error loading schedule. (Feature only for Doctors/Patients)</p>';
         const visits = await res.json();
 
         let headers = '';
-        let rows = '';
+        let renderRow;
 
         if (state.role === 'Doctor') {
             headers = '<tr><th>Date</th><th>Time</th><th>Patient</th><th>Type</th><th>Actions</th></tr>';
-            rows = visits.map(v => `<tr>
+            renderRow = v => `<tr>
                 <td>${v.visit_date}</td>
                 <td>${v.time_slot}</td>
                 <td>${v.patient_name || 'N/A'}</td>
                 <td>${v.visit_type}</td>
                 <td><button class="btn btn-secondary" onclick="openNotes(${v.visit_id})" style="padding:2px 8px; font-size:0.8rem">Notes</button></td>
-            </tr> `).join('');
-
-            // Clean View: Only Appointments
-            content.innerHTML = `
-                <h2> My Appointments</h2>
-                <h3>Upcoming Appointments</h3>
-                <table><thead>${headers}</thead><tbody>${rows}</tbody></table>
-            `;
-            return; // Exit here for doctor
-
-            document.getElementById('avail-form').addEventListener('submit', async (e) => {
-                e.preventDefault();
-                // Inputs are now HH:MM from dropdown, but backend handles HH:MM:SS strict.
-                // Our safe append logic is still good to keep.
-                const sVal = document.getElementById('av-start').value;
-                const eVal = document.getElementById('av-end').value;
-
-                const sTime = sVal.split(':').length === 2 ? sVal + ":00" : sVal;
-                const eTime = eVal.split(':').length === 2 ? eVal + ":00" : eVal;
-
-                const payload = [{
-                    day_of_week: parseInt(document.getElementById('av-day').value),
-                    start_time: sTime,
-                    end_time: eTime,
-                    max_patients_per_slot: 10
-                }];
-
-                const pRes = await authFetch('/doctor/me/availability', { method: 'POST', body: JSON.stringify(payload) });
-                if (pRes.ok) alert("Availability Added!");
-                else {
-                    const err = await pRes.json();
-                    alert("Error: " + (err.detail || "Unknown error"));
-                }
-            });
-            return; // Exit here for doctor
-
+            </tr> `;
         } else {
             headers = '<tr><th>Date</th><th>Time</th><th>Doctor</th><th>Type</th><th>Action</th></tr>';
-            rows = visits.map(v => `<tr>
+            renderRow = v => `<tr>
                 <td>${v.visit_date}</td>
                 <td>${v.time_slot}</td>
                 <td>${v.doctor_name || 'Dr. ' + v.doctor_id}</td>
                 <td><span class="badge badge-confirmed">${v.visit_type}</span></td>
                 <td><button class="btn" style="background:var(--danger-color);padding:5px 10px;font-size:0.8rem" onclick="cancelMyVisit(${v.visit_id})">Cancel</button></td>
-            </tr> `).join('');
+            </tr> `;
         }
 
-        let html = `
+        content.innerHTML = `
                 <h2> My Appointments</h2>
                     <table>
                         <thead>${headers}</thead>
-                        <tbody>${rows}</tbody>
+                        <tbody id="my-schedule-rows">${visits.map(renderRow).join('')}</tbody>
                     </table>
+                    <button id="my-schedule-more" class="btn btn-secondary" style="display:none; margin-top:10px">Load more</button>
             `;
-        content.innerHTML = html;
+
+        const moreBtn = document.getElementById('my-schedule-more');
+        let nextCursor = res.headers.get('X-Next-Cursor');
+        moreBtn.style.display = nextCursor ? '' : 'none';
+        moreBtn.addEventListener('click', async () => {
+            const pageRes = await fetchPage(nextCursor);
+            if (!pageRes.ok) return;
+            const page = await pageRes.json();
+            document.getElementById('my-schedule-rows').insertAdjacentHTML('beforeend', page.map(renderRow).join(''));
+            nextCursor = pageRes.headers.get('X-Next-Cursor');
+            moreBtn.style.display = nextCursor ? '' : 'none';
+        });
     }
     else if (viewName === 'doctor-availability') {
         // ... (existing code) ...
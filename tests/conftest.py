@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Isolated database and caches; set before main is imported, since it reads them at import
+_tmp = tempfile.mkdtemp(prefix="polyclinic-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'polyclinic.db')}"
+os.environ["AVAILABILITY_CACHE_DIR"] = os.path.join(_tmp, "availability_cache")
+os.environ["RATE_LIMIT_DB"] = ""
+os.environ["EMAIL_TRANSPORT"] = "console"
+os.chdir(ROOT) # static/ is mounted relative to the working directory
+sys.path.insert(0, ROOT)
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as c:
+        yield c
+
+
+def login(client, username, password):
+    r = client.post("/auth/login", data={"username": username, "password": password})
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    return login(client, "admin", "admin123")
+
+
+@pytest.fixture
+def doctor_id(client, admin_headers):
+    r = client.post("/admin/doctors", json={
+        "username": f"doc_{uuid.uuid4().hex[:8]}", "password": "p", "name": "Dr Test", "specialization": "General"
+    }, headers=admin_headers)
+    assert r.status_code == 200, r.text
+    return r.json()["doctor_id"]
@@ -0,0 +1,47 @@
+import os
+import threading
+
+import main
+
+
+def test_concurrent_stores_of_one_doctor(client, doctor_id, capsys):
+    db = main.SessionLocal()
+    try:
+        cal = main.availability_calendar.get(db, doctor_id)
+    finally:
+        db.close()
+    errors = []
+
+    def writer():
+        try:
+            for _ in range(50):
+                main.availability_calendar.store(cal)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert "Calendar Cache Write Error" not in capsys.readouterr().out
+    cache_dir = main.availability_calendar.cache_dir
+    assert not [name for name in os.listdir(cache_dir) if name.endswith(".tmp")]
+
+
+def test_cache_directory_is_per_database(client, doctor_id, monkeypatch):
+    cache = main.availability_calendar
+    assert os.path.dirname(cache.cache_dir) == main.AVAILABILITY_CACHE_DIR
+    first = main.database_identity()
+    assert first == main.database_identity() # Stable for one database
+
+    # Another database (different URL) gets a different directory
+    monkeypatch.setattr(main, "DATABASE_URL", main.DATABASE_URL + "?other")
+    assert main.database_identity() != first
+
+    # A recreated database gets a new token, even at the same URL
+    monkeypatch.undo()
+    main.DatabaseInstance.__table__.drop(bind=main.engine)
+    assert main.database_identity() != first
@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+
+
+def test_waiting_for_stuck_migration_lease_fails_clearly(client, monkeypatch, capsys):
+    db = main.SessionLocal()
+    try:
+        db.merge(main.SchedulerLease(name="migrations", holder="stuck-worker", expires_at=datetime.utcnow() + timedelta(hours=1)))
+        db.commit()
+        monkeypatch.setattr(main, "MIGRATION_WAIT_SECONDS", 1)
+        with pytest.raises(RuntimeError, match="stuck-worker"):
+            main.run_migrations()
+        assert "waiting for stuck-worker" in capsys.readouterr().out
+    finally:
+        db.query(main.SchedulerLease).filter(main.SchedulerLease.name == "migrations").delete()
+        db.commit()
+        db.close()
+
+
+def test_migrations_run_and_release_the_lease(client):
+    main.run_migrations()
+    assert main.lease_holder("migrations") is None
+
+
+def test_old_sqlite_is_refused(monkeypatch):
+    monkeypatch.setattr(main.sqlite3, "sqlite_version_info", (3, 31, 1))
+    monkeypatch.setattr(main.sqlite3, "sqlite_version", "3.31.1")
+    with pytest.raises(RuntimeError, match="3.35.0"):
+        main.check_sqlite_version()
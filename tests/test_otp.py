@@ -0,0 +1,36 @@
+import re
+import uuid
+
+import main
+
+
+def otp_from_outbox(email):
+    db = main.SessionLocal()
+    try:
+        row = db.query(main.EmailOutbox).filter(main.EmailOutbox.to_email == email).one()
+        return re.search(r"Code is: (\d+)", row.body).group(1)
+    finally:
+        db.close()
+
+
+def test_issued_code_is_emailed_and_usable(client):
+    email = f"{uuid.uuid4().hex[:8]}@example.com"
+    assert client.post("/auth/otp/send", json={"email": email}).status_code == 200
+    code = otp_from_outbox(email)
+    assert client.post("/auth/otp/verify", json={"email": email, "code": code}).status_code == 200
+
+
+def test_code_not_valid_when_email_cannot_be_queued(client, monkeypatch):
+    email = f"{uuid.uuid4().hex[:8]}@example.com"
+
+    def broken_queue(db, to_email, otp_code):
+        raise RuntimeError("outbox unavailable")
+
+    monkeypatch.setattr(main, "send_otp_email", broken_queue)
+    assert client.post("/auth/otp/send", json={"email": email}).status_code == 500
+    assert not [key for key in main.otp_store.codes if key[0] == email]
+    db = main.SessionLocal()
+    try:
+        assert db.query(main.OTP).filter(main.OTP.email == email).count() == 0
+    finally:
+        db.close()
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+import main
+
+
+def test_no_suggestions_for_past_date(client, admin_headers, doctor_id):
+    today, _ = main.public_now()
+    yesterday = (today - timedelta(days=1)).isoformat()
+    r = client.get("/suggestions", params={"date": yesterday, "doctor_id": doctor_id}, headers=admin_headers)
+    assert r.status_code == 200
+    assert r.json() == []
+    r = client.get("/suggestions", params={"date": yesterday}, headers=admin_headers)
+    assert r.json() == []
+
+
+def test_suggestions_for_future_date(client, admin_headers, doctor_id):
+    today, _ = main.public_now()
+    tomorrow = (today + timedelta(days=1)).isoformat()
+    r = client.get("/suggestions", params={"date": tomorrow, "doctor_id": doctor_id}, headers=admin_headers)
+    assert r.status_code == 200
+    assert r.json()
+
+
+def test_past_date_has_no_candidates(client, admin_headers, doctor_id):
+    today, now = main.public_now()
+    db = main.SessionLocal()
+    try:
+        cal = main.availability_calendar.get(db, doctor_id)
+    finally:
+        db.close()
+    past = today - timedelta(days=1)
+    assert list(main.suggestion_candidates(cal.day(past), past, {}, None, today, now)) == []
@@ -0,0 +1,32 @@
+import uuid
+
+from conftest import login
+
+
+def make_receptionist(client, admin_headers):
+    username = f"rec_{uuid.uuid4().hex[:8]}"
+    r = client.post("/admin/users", json={"username": username, "password": "p", "role": "Receptionist"}, headers=admin_headers)
+    assert r.status_code == 200, r.text
+    staff = client.get("/admin/staff", headers=admin_headers).json()
+    return username, next(u["id"] for u in staff if u["username"] == username)
+
+
+def test_login_in_same_second_as_revocation_is_valid(client, admin_headers):
+    username, user_id = make_receptionist(client, admin_headers)
+    for _ in range(5): # Each round revokes and logs in again within the same second
+        old = login(client, username, "p")
+        assert client.get("/stats/dashboard", headers=old).status_code == 200
+        r = client.post(f"/admin/users/{user_id}/revoke-tokens", headers=admin_headers)
+        assert r.status_code == 200, r.text
+        fresh = login(client, username, "p")
+        assert client.get("/stats/dashboard", headers=old).status_code == 401
+        assert client.get("/stats/dashboard", headers=fresh).status_code == 200
+
+
+def test_logout_revokes_only_that_token(client, admin_headers):
+    username, _ = make_receptionist(client, admin_headers)
+    first = login(client, username, "p")
+    second = login(client, username, "p")
+    assert client.post("/auth/logout", headers=first).status_code == 200
+    assert client.get("/stats/dashboard", headers=first).status_code == 401
+    assert client.get("/stats/dashboard", headers=second).status_code == 200